@@ -1,10 +1,15 @@
 from abc import ABC, abstractmethod
-from typing import Dict
-from sqlalchemy import create_engine, Column, String, Float, ForeignKey
-from sqlalchemy.orm import declarative_base, sessionmaker, relationship
+from typing import Dict, Iterable, Optional, Tuple
+from sqlalchemy import create_engine, event, inspect, literal_column, select, text, Column, Computed, String, Float, ForeignKey, Index
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.schema import CreateColumn
+from sqlalchemy.orm import declarative_base, sessionmaker, relationship, joinedload, Session
 import csv
+import logging
 import os
-import traceback
+import sqlite3
+
+logger = logging.getLogger(__name__)
 
 # SQLAlchemy base model
 Base = declarative_base()
@@ -12,6 +17,12 @@ Base = declarative_base()
 # Ensuring that CSV filesare loaded from a 'data' directory relative to the script
 DATA_DIR = os.getenv('DATA_DIR', 'data')
 
+# Numeric columns of 'financial.csv', parsed as floats (empty fields become None)
+FINANCIAL_COLUMNS = (
+    'ebitda', 'sales', 'net_profit', 'market_price', 'net_debt',
+    'assets', 'equity', 'cash_equivalents', 'liabilities'
+)
+
 
 class Company(Base):
     __tablename__ = 'companies'
@@ -25,6 +36,12 @@ class Company(Base):
 
 class Financial(Base):
     __tablename__ = 'financial'
+    __table_args__ = (
+        # Indexes over the generated ratios ranked by the top ten menu
+        Index('ix_fin_nd_ebitda', 'nd_ebitda'),
+        Index('ix_fin_roe', 'roe'),
+        Index('ix_fin_roa', 'roa')
+    )
 
     ticker = Column(String, ForeignKey('companies.ticker'), primary_key=True)
     ebitda = Column(Float)
@@ -37,6 +54,16 @@ class Financial(Base):
     cash_equivalents = Column(Float)
     liabilities = Column(Float)
 
+    # Financial indicators, generated by the database from the row's values (VIRTUAL columns, so they
+    # can be added to tables created by earlier versions; the indexes above store the ranked ones)
+    pe = Column(Float, Computed('market_price / NULLIF(net_profit, 0)', persisted=False))
+    ps = Column(Float, Computed('market_price / NULLIF(sales, 0)', persisted=False))
+    pb = Column(Float, Computed('market_price / NULLIF(assets, 0)', persisted=False))
+    nd_ebitda = Column(Float, Computed('net_debt / NULLIF(ebitda, 0)', persisted=False))
+    roe = Column(Float, Computed('net_profit / NULLIF(equity, 0)', persisted=False))
+    roa = Column(Float, Computed('net_profit / NULLIF(assets, 0)', persisted=False))
+    la = Column(Float, Computed('liabilities / NULLIF(assets, 0)', persisted=False))
+
     company = relationship('Company', back_populates='financials')
 
 
@@ -47,7 +74,7 @@ class DatabaseConnection:
 
     def __init__(self, db_url=None):
         """
-        Initialize the database connection and create tables if the database doesn't exist.
+        Initialize the database connection, creating missing tables and upgrading older schemas.
 
         Args:
             db_url (str): The database URL (default: SQLite database).
@@ -57,13 +84,135 @@ class DatabaseConnection:
             db_url = f"sqlite:///{os.path.join(os.getcwd(), 'investor.db')}"
         
         self.db_url = db_url
-        self.engine = create_engine(db_url)        
+        if db_url.startswith('sqlite') and sqlite3.sqlite_version_info < (3, 31, 0):
+            raise RuntimeError(
+                f'SQLite 3.31 or newer is required for the generated ratio columns (found {sqlite3.sqlite_version}).'
+            )
+
+        self.engine = create_engine(db_url, query_cache_size=1200)  # Larger compiled-statement cache
         self.Session = sessionmaker(bind=self.engine)  # Session factory
+
+        # Top ten results by metric, cleared by every operation that changes the data
+        self._top_ten_cache: Dict[str, Tuple[Tuple[str, float], ...]] = {}
+
+        # SQLite connection settings: temporary data and a larger page cache kept in memory
+        if self.engine.dialect.name == 'sqlite':
+            event.listen(self.engine, 'connect', self._set_sqlite_pragmas)
         
-        # Checking if the database file already exists
-        db_path = self.db_url.replace('sqlite:///', '')
-        if not os.path.exists(db_path):
-            Base.metadata.create_all(self.engine)
+        # Creating the missing tables, then adding what earlier versions of existing tables lack
+        Base.metadata.create_all(self.engine)
+        self._upgrade_schema()
+
+        # Full-text index used by the company search (SQLite builds with FTS5 only)
+        self.fts_enabled = self.engine.dialect.name == 'sqlite' and self._create_company_fts()
+
+    @staticmethod
+    def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+        """
+        Applies the SQLite PRAGMAs to every new DBAPI connection.
+
+        Args:
+            dbapi_connection: The raw sqlite3 connection.
+            connection_record: The pool's record of the connection (unused).
+        """
+        cursor = dbapi_connection.cursor()
+        cursor.execute('PRAGMA temp_store=MEMORY')
+        cursor.execute('PRAGMA cache_size=-65536')
+        cursor.close()
+
+    def _upgrade_schema(self) -> None:
+        """
+        Adds the generated ratio columns and their indexes to a 'financial' table created by an earlier version.
+        """
+        table = Financial.__table__
+        existing_columns = {column['name'] for column in inspect(self.engine).get_columns(table.name)}
+
+        with self.engine.begin() as connection:
+            for column in table.columns:
+                if column.computed is not None and column.name not in existing_columns:
+                    column_ddl = CreateColumn(column).compile(dialect=self.engine.dialect)
+                    connection.exec_driver_sql(f'ALTER TABLE {table.name} ADD COLUMN {column_ddl}')
+
+            for index in table.indexes:
+                index.create(connection, checkfirst=True)
+
+    def _create_company_fts(self) -> bool:
+        """
+        Creates the 'companies_fts' full-text index over the companies and the triggers keeping it in sync.
+
+        The trigram tokenizer lets the index answer LIKE '%...%' substring searches. The index is an
+        external-content table keyed on the implicit rowid of 'companies', which VACUUM may renumber;
+        after a VACUUM, run "INSERT INTO companies_fts(companies_fts) VALUES ('rebuild')".
+
+        Returns:
+            bool: True if the index is available, False if SQLite was built without FTS5 or its trigram tokenizer.
+        """
+        try:
+            with self.engine.begin() as connection:
+                existing = connection.exec_driver_sql("SELECT sql FROM sqlite_master WHERE name = 'companies_fts'").scalar()
+                if existing and 'trigram' in existing:
+                    return True
+
+                # Replacing an index created with the earlier word tokenizer
+                connection.exec_driver_sql('DROP TABLE IF EXISTS companies_fts')
+                for trigger in ('companies_fts_ai', 'companies_fts_ad', 'companies_fts_au'):
+                    connection.exec_driver_sql(f'DROP TRIGGER IF EXISTS {trigger}')
+
+                connection.exec_driver_sql(
+                    "CREATE VIRTUAL TABLE companies_fts USING fts5("
+                    "ticker UNINDEXED, name, sector, content='companies', tokenize='trigram')"
+                )
+                connection.exec_driver_sql(
+                    "CREATE TRIGGER companies_fts_ai AFTER INSERT ON companies BEGIN "
+                    "INSERT INTO companies_fts(rowid, ticker, name, sector) "
+                    "VALUES (new.rowid, new.ticker, new.name, new.sector); END"
+                )
+                connection.exec_driver_sql(
+                    "CREATE TRIGGER companies_fts_ad AFTER DELETE ON companies BEGIN "
+                    "INSERT INTO companies_fts(companies_fts, rowid, ticker, name, sector) "
+                    "VALUES ('delete', old.rowid, old.ticker, old.name, old.sector); END"
+                )
+                connection.exec_driver_sql(
+                    "CREATE TRIGGER companies_fts_au AFTER UPDATE ON companies BEGIN "
+                    "INSERT INTO companies_fts(companies_fts, rowid, ticker, name, sector) "
+                    "VALUES ('delete', old.rowid, old.ticker, old.name, old.sector); "
+                    "INSERT INTO companies_fts(rowid, ticker, name, sector) "
+                    "VALUES (new.rowid, new.ticker, new.name, new.sector); END"
+                )
+
+                # Indexing the companies already stored in the database
+                connection.exec_driver_sql("INSERT INTO companies_fts(companies_fts) VALUES ('rebuild')")
+            return True
+        except OperationalError:
+            return False
+
+    def get_cached_top_ten(self, metric: str) -> Optional[Tuple[Tuple[str, float], ...]]:
+        """
+        Returns the cached top ten results for a metric.
+
+        Args:
+            metric (str): The financial metric the companies were ranked by.
+
+        Returns:
+            Optional[Tuple[Tuple[str, float], ...]]: The cached (ticker, ratio) pairs, or None if not cached.
+        """
+        return self._top_ten_cache.get(metric)
+
+    def cache_top_ten(self, metric: str, results: Tuple[Tuple[str, float], ...]) -> None:
+        """
+        Caches the top ten results for a metric until the next invalidation.
+
+        Args:
+            metric (str): The financial metric the companies were ranked by.
+            results (Tuple[Tuple[str, float], ...]): The (ticker, ratio) pairs, highest ratio first.
+        """
+        self._top_ten_cache[metric] = results
+
+    def invalidate_cache(self) -> None:
+        """
+        Discards the cached top ten results. Must be called after every change to the data.
+        """
+        self._top_ten_cache.clear()
     
     def clear_database(self) -> None:
         """
@@ -74,14 +223,35 @@ class DatabaseConnection:
                 session.query(Financial).delete()
                 session.query(Company).delete()
                 session.commit()
-            except Exception as e:
+                self.invalidate_cache()
+            except Exception:
                 session.rollback()
-                print(f'Error clearing the database: {e}')
-                traceback.print_exc()
+                logger.exception('Error clearing the database')
+
+    @staticmethod
+    def _bulk_insert(cursor, table: str, columns: Tuple[str, ...], rows: Iterable[tuple], upsert: bool) -> None:
+        """
+        Inserts rows with a single prepared statement executed over all rows.
+
+        Args:
+            cursor: The DBAPI cursor of the loading transaction.
+            table (str): The name of the table.
+            columns (Tuple[str, ...]): The names of the columns, in the order of the row values.
+                The first column is the table's primary key.
+            rows (Iterable[tuple]): The rows to insert, consumed lazily by executemany.
+            upsert (bool): If True, rows with an existing primary key update the stored ones in place,
+                keeping their rowids (which the full-text index is keyed on).
+        """
+        placeholders = ', '.join('?' * len(columns))
+        statement = f'INSERT INTO {table} ({", ".join(columns)}) VALUES ({placeholders})'
+        if upsert:
+            assignments = ', '.join(f'{column} = excluded.{column}' for column in columns[1:])
+            statement += f' ON CONFLICT({columns[0]}) DO UPDATE SET {assignments}'
+        cursor.executemany(statement, rows)
 
     def insert_data(self, force_reload: bool = False) -> None:
         """
-        Inserting data from CSV files into the database using SQLAlchemy ORM.
+        Inserting data from CSV files into the database using bulk DBAPI inserts.
 
         Args:
             force_reload (bool): If True, the data will be reloaded even if there are companies in the database. 
@@ -91,55 +261,73 @@ class DatabaseConnection:
         financial_csv = os.path.join(DATA_DIR, 'financial.csv')
         
         with self.Session() as session:
-            if force_reload or session.query(Company).count() == 0:
-                try:
-                    # Ensure CSV files are present
-                    if not os.path.exists(companies_csv) or not os.path.exists(financial_csv):
-                        print('CSV files not found. Please ensure that "companies.csv" and "financial.csv" are in the "data" directory.')
-                        return
-                    
-                    # Load data from companies.csv
-                    with open(companies_csv, newline='') as file:
-                        reader = csv.DictReader(file)
-                        for row in reader:
-                            company = Company(
-                                ticker=row.get('ticker'),
-                                name=row.get('name'),
-                                sector=row.get('sector', None)
-                            )
-                            session.merge(company)
-
-                    # Load data from financial.csv
-                    with open(financial_csv, newline='') as file:
-                        reader = csv.DictReader(file)
-                        for row in reader:
-                            financial = Financial(
-                                ticker=row['ticker'],
-                                ebitda=float(row.get('ebitda', 0)) if row.get('ebitda') else None,
-                                sales=float(row.get('sales', 0)) if row.get('sales') else None,
-                                net_profit=float(row.get('net_profit', 0)) if row.get('net_profit') else None,
-                                market_price=float(row.get('market_price', 0)) if row.get('market_price') else None,
-                                net_debt=float(row.get('net_debt', 0)) if row.get('net_debt') else None,
-                                assets=float(row.get('assets', 0)) if row.get('assets') else None,
-                                equity=float(row.get('equity', 0)) if row.get('equity') else None,
-                                cash_equivalents=float(row.get('cash_equivalents', 0)) if row.get('cash_equivalents') else None,
-                                liabilities=float(row.get('liabilities', 0)) if row.get('liabilities') else None
-                            )
-                            session.merge(financial)
-
-                    session.commit()
-                    print('Data inserted successfully!')
-
-                except Exception as e:
-                    session.rollback()
-                    print(f'Error inserting data: {e}')
-                    traceback.print_exc()
+            has_companies = session.query(Company.ticker).limit(1).first() is not None
+
+        if has_companies and not force_reload:
+            return
+
+        # Ensure CSV files are present
+        if not os.path.exists(companies_csv) or not os.path.exists(financial_csv):
+            print('CSV files not found. Please ensure that "companies.csv" and "financial.csv" are in the "data" directory.')
+            return
+
+        # Both tables are loaded through one cursor and committed as a single transaction
+        raw_connection = self.engine.raw_connection()
+        cursor = raw_connection.cursor()
+        synchronous = cursor.execute('PRAGMA synchronous').fetchone()[0]
+        journal_mode = cursor.execute('PRAGMA journal_mode').fetchone()[0]
+        try:
+            # Bulk-load fast path for this load only: no fsync on commit, journal kept in memory
+            cursor.execute('PRAGMA synchronous=OFF')
+            cursor.execute('PRAGMA journal_mode=MEMORY')
+
+            # Rows are parsed while executemany consumes them, without building intermediate lists.
+            # The initial load into empty tables uses plain inserts; a reload updates the existing
+            # rows in place, matching the previous merge semantics.
+
+            # Load data from companies.csv
+            with open(companies_csv, newline='') as file:
+                companies = (
+                    (row.get('ticker'), row.get('name'), row.get('sector', None))
+                    for row in csv.DictReader(file)
+                )
+                self._bulk_insert(cursor, Company.__tablename__, ('ticker', 'name', 'sector'), companies, upsert=has_companies)
+
+            # Load data from financial.csv
+            with open(financial_csv, newline='') as file:
+                financials = (
+                    (row['ticker'], *[float(value) if value else None for value in map(row.get, FINANCIAL_COLUMNS)])
+                    for row in csv.DictReader(file)
+                )
+                self._bulk_insert(cursor, Financial.__tablename__, ('ticker',) + FINANCIAL_COLUMNS, financials, upsert=has_companies)
+
+            raw_connection.commit()
+            self.invalidate_cache()
+            print('Data inserted successfully!')
+
+        except Exception:
+            raw_connection.rollback()
+            logger.exception('Error inserting data')
+
+        finally:
+            try:
+                # Ending any transaction left open (e.g. by a KeyboardInterrupt), since SQLite ignores a
+                # journal_mode change inside one; after a commit or rollback this does nothing
+                raw_connection.rollback()
+
+                # Restoring the durable settings before the connection returns to the pool
+                cursor.execute(f'PRAGMA journal_mode={journal_mode}')
+                cursor.execute(f'PRAGMA synchronous={synchronous}')
+            finally:
+                raw_connection.close()
 
 
 class Menu(ABC):
     """
     Abstract base class for menus.
     """
+    __slots__ = ('title', 'options', '_sorted_keys')
+
     def __init__(self, title: str, options: Dict[str, str]) -> None:
         """
         Initialize the menu with a title and options.
@@ -150,13 +338,14 @@ class Menu(ABC):
         """
         self.title = title
         self.options = options
+        self._sorted_keys = sorted(options.keys())  # Options never change, so they are sorted once
 
     def display(self) -> None:
         """
         Display the menu options.
         """
         print(f'\n{self.title}')
-        for key in sorted(self.options.keys()):
+        for key in self._sorted_keys:
             print(f'{key} {self.options[key]}')
 
     @abstractmethod
@@ -171,12 +360,15 @@ class MainMenu(Menu):
     """
     Main menu of the application.
     """
-    def __init__(self, db_connection: DatabaseConnection) -> None:
+    __slots__ = ('crud_menu', 'top_ten_menu')
+
+    def __init__(self, db_connection: DatabaseConnection, session: Session) -> None:
         """
-        Initialize the main menu with its options and pass the database connection.
+        Initialize the main menu with its options and pass the database connection to its submenus.
 
         Args:
             db_connection (DatabaseConnection): The database connection object.
+            session (Session): The session shared by all menus.
         """
         options = {
             '0': 'Exit',
@@ -184,7 +376,10 @@ class MainMenu(Menu):
             '2': 'Show top ten companies by criteria'
         }
         super().__init__('MAIN MENU', options)
-        self.db_connection = db_connection
+
+        # Submenus are created once and reused every time they are entered
+        self.crud_menu = CrudMenu(db_connection, session)
+        self.top_ten_menu = TopTenMenu(db_connection, session)
 
     def execute(self) -> None:
         """
@@ -198,11 +393,9 @@ class MainMenu(Menu):
                 print('Have a nice day!')
                 break
             elif choice == '1':
-                submenu = CrudMenu(self.db_connection)
-                submenu.execute()
+                self.crud_menu.execute()
             elif choice == '2':
-                submenu = TopTenMenu(self.db_connection)
-                submenu.execute()
+                self.top_ten_menu.execute()
             else:
                 print('Invalid option!')
 
@@ -211,12 +404,26 @@ class CrudMenu(Menu):
     """
     CRUD operations menu.
     """
-    def __init__(self, db_connection: DatabaseConnection) -> None:
+    __slots__ = ('db_connection', 'session')
+
+    # Label and generated Financial column of each financial indicator shown by read_company
+    RATIOS = (
+        ('P/E', 'pe'),
+        ('P/S', 'ps'),
+        ('P/B', 'pb'),
+        ('ND/EBITDA', 'nd_ebitda'),
+        ('ROE', 'roe'),
+        ('ROA', 'roa'),
+        ('L/A', 'la')
+    )
+
+    def __init__(self, db_connection: DatabaseConnection, session: Session) -> None:
         """
         Initialize the CRUD menu with its options and database connection
 
         Args:
             db_connection (DatabaseConnection): The database connection object.
+            session (Session): The session shared by all menus.
         """
         options = {
             '0': 'Back',
@@ -228,6 +435,7 @@ class CrudMenu(Menu):
         }
         super().__init__('CRUD MENU', options)
         self.db_connection = db_connection
+        self.session = session
     
     def get_float_input(self, prompt: str) -> float:
         """
@@ -265,8 +473,8 @@ class CrudMenu(Menu):
         cash_equivalents = self.get_float_input("Enter cash equivalents (in the format '987654321'):\n")
         liabilities = self.get_float_input("Enter liabilities (in the format '987654321'):\n")
         
-        with self.db_connection.Session() as session:
-            try:
+        try:
+            with self.session.begin():
                 # Creating a Company object
                 company = Company(ticker=ticker, name=name, sector=sector)
 
@@ -284,23 +492,39 @@ class CrudMenu(Menu):
                     liabilities=liabilities
                 )
 
-                session.merge(company)
-                session.merge(financial)
-                session.commit()
+                self.session.merge(company)
+                self.session.merge(financial)
 
-                print('Company created successfully!')
+            self.db_connection.invalidate_cache()
+            print('Company created successfully!')
 
-            except Exception as e:
-                session.rollback()
-                print(f'An error occurred: {e}')
-                traceback.print_exc()
+        except Exception:
+            logger.exception('An error occurred')
     
-    def company_search(self, session) -> object:
+    def company_search(self) -> object:
         """
         Reades companies by name and returns the selected company object.
         """
         company_name = input('Enter company name:\n')
-        companies = session.query(Company).filter(Company.name.ilike(f'%{company_name}%')).all()
+
+        pattern = f'%{company_name}%'
+        if self.db_connection.fts_enabled:
+            # Same case-insensitive substring match as ILIKE, answered by the trigram index in the same
+            # statement (patterns shorter than three characters scan the index instead)
+            name_filter = text(
+                'companies.rowid IN (SELECT rowid FROM companies_fts WHERE name LIKE :pattern)'
+            ).bindparams(pattern=pattern)
+        else:
+            name_filter = Company.name.ilike(pattern)
+
+        # Listing in insertion order, so both search paths number the companies the same way
+        companies = (
+            self.session.query(Company)
+            .options(joinedload(Company.financials))
+            .filter(name_filter)
+            .order_by(literal_column('companies.rowid'))
+            .all()
+        )
             
         if not companies:
             print('Company not found!')
@@ -324,54 +548,37 @@ class CrudMenu(Menu):
         """
         Displayes company financial indicators.
         """        
-        with self.db_connection.Session() as session:
-            try:
-                selected_company = self.company_search(session)
+        try:
+            with self.session.begin():
+                selected_company = self.company_search()
                 if not selected_company:
                     return
                 
-                financial = session.query(Financial).filter(Financial.ticker == selected_company.ticker).first()
+                financial = selected_company.financials
                 if not financial:
                     print('No financial data found for the selected company!')
                     return
 
-                # Calculation of the company's financial indicators
-                try:
-                    pe_ratio = financial.market_price / financial.net_profit if financial.net_profit else None
-                    ps_ratio = financial.market_price / financial.sales if financial.sales else None
-                    pb_ratio = financial.market_price / financial.assets if financial.assets else None
-                    nd_ebitda_ratio = financial.net_debt / financial.ebitda if financial.ebitda else None
-                    roe_ratio = financial.net_profit / financial.equity if financial.equity else None
-                    roa_ratio = financial.net_profit / financial.assets if financial.assets else None
-                    la_ratio = financial.liabilities / financial.assets if financial.assets else None
-                except ZeroDivisionError:
-                    print('Error in calculating ratios due to division by zero.')
-                    return    
-
                 # Displaying the company's ticker, name, and financial indicators
                 print(f'\n{selected_company.ticker} {selected_company.name}')
-                print(f'P/E = {pe_ratio:.2f}' if pe_ratio is not None else 'P/E = None')
-                print(f"P/S = {ps_ratio:.2f}" if ps_ratio is not None else "P/S = None")
-                print(f"P/B = {pb_ratio:.2f}" if pb_ratio is not None else "P/B = None")
-                print(f"ND/EBITDA = {nd_ebitda_ratio:.2f}" if nd_ebitda_ratio is not None else "ND/EBITDA = None")
-                print(f"ROE = {roe_ratio:.2f}" if roe_ratio is not None else "ROE = None")
-                print(f"ROA = {roa_ratio:.2f}" if roa_ratio is not None else "ROA = None")
-                print(f"L/A = {la_ratio:.2f}" if la_ratio is not None else "L/A = None")
-
-            except Exception as e:
-                print(f'An error occurred: {e}')
+                for label, column in self.RATIOS:
+                    ratio = getattr(financial, column)
+                    print(f'{label} = {ratio:.2f}' if ratio is not None else f'{label} = None')
+
+        except Exception as e:
+            print(f'An error occurred: {e}')
     
     def update_company(self) -> None:
         """
         Updates company financial information.
         """
-        with self.db_connection.Session() as session:
-            try:
-                selected_company = self.company_search(session)
+        try:
+            with self.session.begin():
+                selected_company = self.company_search()
                 if not selected_company:
                     return
                 
-                financial = session.query(Financial).filter(Financial.ticker == selected_company.ticker).first()
+                financial = selected_company.financials
                 if not financial:
                     print('No financial data found for the selected company!')
                     return
@@ -387,52 +594,55 @@ class CrudMenu(Menu):
                 financial.cash_equivalents = self.get_float_input("Enter cash equivalents (in the format '987654321'):\n")
                 financial.liabilities = self.get_float_input("Enter liabilities (in the format '987654321'):\n")
 
-                session.commit()
-                print('Company updated successfully!')
+            self.db_connection.invalidate_cache()
+            print('Company updated successfully!')
 
-            except Exception as e:
-                session.rollback()
-                print(f'An error occurred: {e}')
-                traceback.print_exc()
+        except Exception:
+            logger.exception('An error occurred')
         
     def delete_company(self) -> None:
         """
         Deletes a company.
         """
-        with self.db_connection.Session() as session:
-            try:
-                selected_company = self.company_search(session)
+        try:
+            with self.session.begin():
+                selected_company = self.company_search()
                 if not selected_company:
                     return
                 
-                session.delete(selected_company)
-                session.commit()
-                print('Company deleted successfully!')
+                self.session.delete(selected_company)
 
-            except Exception as e:
-                session.rollback()
-                print(f'An error occurred: {e}')
-                traceback.print_exc()
+            self.db_connection.invalidate_cache()
+            print('Company deleted successfully!')
+
+        except Exception:
+            logger.exception('An error occurred')
     
     def list_companies(self) -> None:
         """
         Lists the companies' ticker, name, and industry, ordered by ticker.
         """
-        with self.db_connection.Session() as session:
-            try:
-                ordered_companies = session.query(Company).order_by(Company.ticker).all()
-
-                if not ordered_companies:
-                    print('No companies found!')
-                    return
+        try:
+            with self.session.begin():
+                # Rows are streamed from the cursor in batches instead of being loaded all at once
+                statement = (
+                    select(Company.ticker, Company.name, Company.sector)
+                    .order_by(Company.ticker)
+                    .execution_options(yield_per=500)
+                )
 
-                print('\nCOMPANY LIST')
+                companies_found = False
+                for ticker, name, sector in self.session.execute(statement):
+                    if not companies_found:
+                        print('\nCOMPANY LIST')
+                        companies_found = True
+                    print(f'{ticker} {name} {sector}')
 
-                for company in ordered_companies:
-                    print(f'{company.ticker} {company.name} {company.sector}')
+                if not companies_found:
+                    print('No companies found!')
 
-            except Exception as e:
-                print(f'An error occurred: {e}')
+        except Exception as e:
+            print(f'An error occurred: {e}')
 
     def execute(self) -> None:
         """
@@ -468,9 +678,22 @@ class TopTenMenu(Menu):
     """
     Top ten companies menu.
     """
-    def __init__(self, db_connection: DatabaseConnection) -> None:
+    __slots__ = ('db_connection', 'session')
+
+    # Generated Financial column of each ranking metric
+    METRICS = {
+        'ND/EBITDA': Financial.nd_ebitda,
+        'ROE': Financial.roe,
+        'ROA': Financial.roa
+    }
+
+    def __init__(self, db_connection: DatabaseConnection, session: Session) -> None:
         """
         Initialize the top ten menu with its options and database connection.
+
+        Args:
+            db_connection (DatabaseConnection): The database connection object, holding the cached top ten results.
+            session (Session): The session shared by all menus.
         """
         options = {
             '0': 'Back',
@@ -480,7 +703,35 @@ class TopTenMenu(Menu):
         }
         super().__init__('TOP TEN MENU', options)
         self.db_connection = db_connection
+        self.session = session
     
+    def _top_ten(self, metric: str) -> Tuple[Tuple[str, float], ...]:
+        """
+        Query the top ten companies by a metric. Results are cached on the database connection until the data changes.
+
+        Args:
+            metric (str): The financial metric to rank companies by ('ND/EBITDA', 'ROE', 'ROA').
+
+        Returns:
+            Tuple[Tuple[str, float], ...]: The (ticker, ratio) pairs, highest ratio first.
+        """
+        results = self.db_connection.get_cached_top_ten(metric)
+        if results is not None:
+            return results
+
+        # Filtering, ordering and limit over the generated ratio are all done by the database
+        ratio = self.METRICS[metric]
+        statement = (
+            select(Financial.ticker, ratio)
+            .where(ratio.isnot(None), ratio != 0)
+            .order_by(ratio.desc())
+            .limit(10)
+        )
+        with self.session.begin():
+            results = tuple((ticker, value) for ticker, value in self.session.execute(statement))
+        self.db_connection.cache_top_ten(metric, results)
+        return results
+
     def calculate_top_ten(self, metric: str) -> None:
         """
         Calculate the top ten companies based on the selected financial metric.
@@ -488,51 +739,19 @@ class TopTenMenu(Menu):
         Args:
             metric (str): The financial metric to rank companies by ('ND/EBITDA', 'ROE', 'ROA').
         """
-        with self.db_connection.Session() as session:
-            try:
-                query = session.query(
-                    Financial.ticker,
-                    Financial.net_debt,
-                    Financial.ebitda,
-                    Financial.net_profit,
-                    Financial.equity,
-                    Financial.assets
-                )
-                
-                if metric == 'ND/EBITDA':
-                    results = [
-                        (row.ticker, row.net_debt / row.ebitda) 
-                        for row in query if row.net_debt and row.ebitda
-                    ]
-                    header = 'ND/EBITDA'
-                
-                elif metric == 'ROE':
-                    results = [
-                        (row.ticker, row.net_profit / row.equity)
-                        for row in query if row.net_profit and row.equity
-                    ]
-                    header = 'ROE'
-                    
-                elif metric == 'ROA':
-                    results = [
-                        (row.ticker, row.net_profit / row.assets)
-                        for row in query if row.net_profit and row.assets
-                    ]
-                    header = 'ROA'  
-                
-                else:
-                    print('Invalid metric selected')
-                    return
-                
-                # Sort and limit to top ten results
-                results.sort(key=lambda x: x[1], reverse=True)
-                print(f'\nTICKER {header}')
-                for ticker, value in results[:10]:
-                    print(f'{ticker} {value:.2f}'.rstrip('0').rstrip('.'))
+        if metric not in self.METRICS:
+            print('Invalid metric selected')
+            return
+
+        try:
+            results = self._top_ten(metric)
+
+            print(f'\nTICKER {metric}')
+            for ticker, value in results:
+                print(f'{ticker} {value:.2f}'.rstrip('0').rstrip('.'))
                 
-            except Exception as e:
-                print(f'Error calculationg {metric}: {e}')
-                traceback.print_exc()
+        except Exception:
+            logger.exception('Error calculating %s', metric)
         
     def execute(self) -> None:
         """
@@ -562,20 +781,26 @@ class MenuManager:
     """
     Manages the execution of menus.
     """
+    __slots__ = ('session', 'current_menu')
+
     def __init__(self, db_connection: DatabaseConnection) -> None:
         """
-        Initializes the MenuManager with the main menu.
+        Initializes the MenuManager with the main menu and the session shared by all menus.
 
         Args:
             db_connection (DatabaseConnection): The database connection object.
         """
-        self.current_menu = MainMenu(db_connection)
+        self.session = db_connection.Session()
+        self.current_menu = MainMenu(db_connection, self.session)
 
     def run(self) -> None:
         """
-        Run the current menu.
+        Run the current menu and close the shared session once it exits.
         """
-        self.current_menu.execute()
+        try:
+            self.current_menu.execute()
+        finally:
+            self.session.close()
 
 
 if __name__ == '__main__':
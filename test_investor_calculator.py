@@ -1,9 +1,10 @@
 import unittest
 from unittest.mock import patch, mock_open
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect, select, text
 from sqlalchemy.orm import sessionmaker
-from investor_calculator import DatabaseConnection, Company, Financial, Base
+from investor_calculator import DatabaseConnection, Company, Financial, Base, CrudMenu, TopTenMenu
 import os
+import tempfile
 
 
 class TestDatabaseConnection(unittest.TestCase):
@@ -166,5 +167,301 @@ class TestDatabaseConnection(unittest.TestCase):
         self.assertEqual(result.sales, 2000000.0)
 
 
+    def test_insert_data_force_reload(self):
+        """
+        Test reloading the CSV data over an already populated database.
+        """
+        db_connection = DatabaseConnection('sqlite:///:memory:')
+
+        # Load the data twice, the second load updates the existing rows in place
+        rowid_query = text("SELECT rowid FROM companies WHERE ticker = 'AAPL'")
+        db_connection.insert_data()
+        with db_connection.Session() as session:
+            rowid_before = session.execute(rowid_query).scalar()
+        db_connection.insert_data(force_reload=True)
+
+        with db_connection.Session() as session:
+            rowid_after = session.execute(rowid_query).scalar()
+            company_count = session.query(Company).count()
+            financial_count = session.query(Financial).count()
+            result = session.query(Financial).filter_by(ticker='AAPL').first()
+
+        # Assertions
+        self.assertEqual(company_count, 98)
+        self.assertEqual(financial_count, 98)
+        self.assertEqual(result.ebitda, 130795000000.0)
+        self.assertEqual(rowid_after, rowid_before)
+
+    def test_insert_data_restores_pragmas(self):
+        """
+        Test that the bulk-load PRAGMAs are restored once the CSV load is done.
+        """
+        with tempfile.TemporaryDirectory() as db_dir:
+            db_connection = DatabaseConnection(f"sqlite:///{os.path.join(db_dir, 'investor.db')}")
+            db_connection.insert_data()
+
+            with db_connection.engine.connect() as connection:
+                synchronous = connection.exec_driver_sql('PRAGMA synchronous').scalar()
+                journal_mode = connection.exec_driver_sql('PRAGMA journal_mode').scalar()
+            db_connection.engine.dispose()
+
+        # Assertions (2 is SQLite's default FULL synchronous mode)
+        self.assertEqual(synchronous, 2)
+        self.assertEqual(journal_mode, 'delete')
+
+    def test_upgrade_schema(self):
+        """
+        Test that a database created without the ratio columns is upgraded on connection.
+        """
+        with tempfile.TemporaryDirectory() as db_dir:
+            db_path = os.path.join(db_dir, 'investor.db')
+
+            # Tables as created by earlier versions, without generated columns or indexes
+            legacy_engine = create_engine(f'sqlite:///{db_path}')
+            with legacy_engine.begin() as connection:
+                connection.exec_driver_sql(
+                    'CREATE TABLE companies (ticker VARCHAR PRIMARY KEY, name VARCHAR, sector VARCHAR)'
+                )
+                connection.exec_driver_sql(
+                    'CREATE TABLE financial (ticker VARCHAR PRIMARY KEY REFERENCES companies (ticker), '
+                    'ebitda FLOAT, sales FLOAT, net_profit FLOAT, market_price FLOAT, net_debt FLOAT, '
+                    'assets FLOAT, equity FLOAT, cash_equivalents FLOAT, liabilities FLOAT)'
+                )
+                connection.exec_driver_sql("INSERT INTO financial (ticker, net_profit, equity) VALUES ('AAA', 10, 40)")
+            legacy_engine.dispose()
+
+            db_connection = DatabaseConnection(f'sqlite:///{db_path}')
+            with db_connection.Session() as session:
+                roe = session.query(Financial.roe).filter_by(ticker='AAA').scalar()
+            index_names = {index['name'] for index in inspect(db_connection.engine).get_indexes('financial')}
+            db_connection.engine.dispose()
+
+        # Assertions
+        self.assertEqual(roe, 0.25)
+        self.assertTrue({'ix_fin_nd_ebitda', 'ix_fin_roe', 'ix_fin_roa'} <= index_names)
+
+    def test_insert_data_restores_pragmas_on_interrupt(self):
+        """
+        Test that the bulk-load PRAGMAs are restored when the load is interrupted mid-transaction.
+        """
+        with tempfile.TemporaryDirectory() as db_dir:
+            db_connection = DatabaseConnection(f"sqlite:///{os.path.join(db_dir, 'investor.db')}")
+
+            # Interrupting the financial load, after the companies were inserted in the open transaction
+            bulk_insert = DatabaseConnection._bulk_insert
+
+            def interrupted_bulk_insert(cursor, table, *args, **kwargs):
+                if table == Financial.__tablename__:
+                    raise KeyboardInterrupt
+                bulk_insert(cursor, table, *args, **kwargs)
+
+            with patch.object(DatabaseConnection, '_bulk_insert', side_effect=interrupted_bulk_insert):
+                with self.assertRaises(KeyboardInterrupt):
+                    db_connection.insert_data()
+
+            with db_connection.engine.connect() as connection:
+                synchronous = connection.exec_driver_sql('PRAGMA synchronous').scalar()
+                journal_mode = connection.exec_driver_sql('PRAGMA journal_mode').scalar()
+            db_connection.engine.dispose()
+
+        # Assertions
+        self.assertEqual(synchronous, 2)
+        self.assertEqual(journal_mode, 'delete')
+
+    @patch('investor_calculator.logger')
+    def test_insert_data_rollback(self, mock_logger):
+        """
+        Test that a failing financial row rolls back the whole CSV load.
+        """
+        with tempfile.TemporaryDirectory() as data_dir:
+            with open(os.path.join(data_dir, 'companies.csv'), 'w') as file:
+                file.write('ticker,name,sector\nAAPL,Apple Inc.,Technology\n')
+            with open(os.path.join(data_dir, 'financial.csv'), 'w') as file:
+                file.write('ticker,ebitda\nAAPL,not-a-number\n')
+
+            db_connection = DatabaseConnection('sqlite:///:memory:')
+            with patch('investor_calculator.DATA_DIR', data_dir):
+                db_connection.insert_data()
+
+        with db_connection.Session() as session:
+            company_count = session.query(Company).count()
+
+        # Assertions
+        mock_logger.exception.assert_called_once()
+        self.assertEqual(company_count, 0)
+
+
+class TestTopTenMenu(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Create a database with a few companies and a session for the menu.
+        """
+        self.db_connection = DatabaseConnection('sqlite:///:memory:')
+        self.session = self.db_connection.Session()
+        self.session.add_all([
+            Financial(ticker="AAA", net_profit=10.0, equity=100.0),
+            Financial(ticker="BBB", net_profit=30.0, equity=100.0),
+            Financial(ticker="CCC", net_profit=0.0, equity=100.0),
+            Financial(ticker="DDD", net_profit=20.0, equity=0.0),
+            Financial(ticker="EEE", net_profit=20.0, equity=100.0)
+        ])
+        self.session.commit()
+
+    def tearDown(self):
+        """
+        Close the session after each test.
+        """
+        self.session.close()
+
+    @patch('builtins.print')
+    def test_calculate_top_ten(self, mock_print):
+        """
+        Test ranking companies by ROE, skipping zero numerators and denominators.
+        """
+        menu = TopTenMenu(self.db_connection, self.session)
+        menu.calculate_top_ten('ROE')
+
+        printed = [call.args[0] for call in mock_print.call_args_list]
+
+        # Assertions
+        self.assertEqual(printed, ['\nTICKER ROE', 'BBB 0.3', 'EEE 0.2', 'AAA 0.1'])
+
+    def test_top_ten_cache(self):
+        """
+        Test that top ten results are cached until the data changes.
+        """
+        menu = TopTenMenu(self.db_connection, self.session)
+        first = menu._top_ten('ROE')
+
+        # A new top company is not visible until the cache is invalidated
+        self.session.add(Financial(ticker="FFF", net_profit=90.0, equity=100.0))
+        self.session.commit()
+        cached = menu._top_ten('ROE')
+        self.db_connection.invalidate_cache()
+        refreshed = menu._top_ten('ROE')
+
+        # Clearing the database invalidates the cache as well
+        self.db_connection.clear_database()
+        cleared = menu._top_ten('ROE')
+
+        # Assertions
+        self.assertIs(cached, first)
+        self.assertEqual(refreshed[0], ('FFF', 0.9))
+        self.assertEqual(cleared, ())
+
+
+class TestCrudMenu(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Create a database loaded from the CSV files and a session for the menu.
+        """
+        self.db_connection = DatabaseConnection('sqlite:///:memory:')
+        self.db_connection.insert_data()
+        self.session = self.db_connection.Session()
+
+    def tearDown(self):
+        """
+        Close the session after each test.
+        """
+        self.session.close()
+
+    @patch('builtins.print')
+    @patch('builtins.input', side_effect=['SOFT', '0'])
+    def test_company_search(self, mock_input, mock_print):
+        """
+        Test searching companies by a substring of their name after a forced reload.
+        """
+        self.db_connection.insert_data(force_reload=True)
+        menu = CrudMenu(self.db_connection, self.session)
+
+        with self.session.begin():
+            company = menu.company_search()
+
+            # Trigram FTS needs SQLite 3.34+; older builds fall back to ILIKE and have no index to check
+            if self.db_connection.fts_enabled:
+                # Raises if the reload left the full-text index out of sync with the companies table
+                self.session.execute(text("INSERT INTO companies_fts(companies_fts, rank) VALUES ('integrity-check', 1)"))
+
+        # Assertions
+        self.assertEqual(company.ticker, 'MSFT')
+        self.assertIsNotNone(company.financials)
+
+    @patch('builtins.print')
+    @patch('builtins.input', side_effect=['Zero Corp', '0'])
+    def test_read_company(self, mock_input, mock_print):
+        """
+        Test displaying the financial indicators, with None for zero denominators.
+        """
+        with self.session.begin():
+            self.session.add(Company(ticker="ZZZ", name="Zero Corp", sector="Technology"))
+            self.session.add(Financial(
+                ticker="ZZZ",
+                ebitda=0.0,
+                sales=50.0,
+                net_profit=10.0,
+                market_price=100.0,
+                net_debt=30.0,
+                assets=200.0,
+                equity=0.0,
+                liabilities=50.0
+            ))
+
+        menu = CrudMenu(self.db_connection, self.session)
+        menu.read_company()
+
+        printed = [call.args[0] for call in mock_print.call_args_list]
+
+        # Assertions
+        self.assertEqual(printed, [
+            '0 Zero Corp',
+            '\nZZZ Zero Corp',
+            'P/E = 10.00',
+            'P/S = 2.00',
+            'P/B = 0.50',
+            'ND/EBITDA = None',
+            'ROE = None',
+            'ROA = 0.05',
+            'L/A = 0.25'
+        ])
+
+    @patch('builtins.print')
+    @patch('builtins.input', side_effect=['.', '0'])
+    def test_company_search_short_pattern(self, mock_input, mock_print):
+        """
+        Test that patterns shorter than a trigram still match like ILIKE.
+        """
+        menu = CrudMenu(self.db_connection, self.session)
+
+        with self.session.begin():
+            menu.company_search()
+            expected = self.session.query(Company).filter(Company.name.ilike('%.%')).count()
+
+        printed = [call.args[0] for call in mock_print.call_args_list]
+
+        # Assertions
+        self.assertGreater(expected, 1)
+        self.assertEqual(len(printed), expected)
+
+    @patch('builtins.print')
+    @patch('builtins.input', side_effect=['a', '0'])
+    def test_company_search_order(self, mock_input, mock_print):
+        """
+        Test that matches are numbered in insertion order on either search path.
+        """
+        menu = CrudMenu(self.db_connection, self.session)
+
+        with self.session.begin():
+            menu.company_search()
+            names = self.session.scalars(
+                select(Company.name).where(Company.name.ilike('%a%')).order_by(text('companies.rowid'))
+            ).all()
+
+        printed = [call.args[0] for call in mock_print.call_args_list]
+
+        # Assertions
+        self.assertEqual(printed, [f'{number} {name}' for number, name in enumerate(names)])
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file